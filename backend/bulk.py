@@ -0,0 +1,147 @@
+"""
+Bulk Import / Export
+Streams archived feed dumps into the database and articles back out,
+without holding the whole dataset in memory
+"""
+
+import os
+import csv
+import json
+
+MISSING_VALUES = frozenset(('', 'N/A', 'None'))
+
+EXPORT_COLUMNS = (
+    'title', 'link', 'description', 'published', 'source',
+    'author', 'category', 'scraped_at', 'image_url', 'states_mentioned'
+)
+
+# ========================================
+# READERS
+# ========================================
+
+def iter_jsonl(path):
+    """Yield one article dict per line of a JSON-lines file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def iter_csv(path):
+    """Yield one article dict per row of a CSV file with a header"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+def iter_json(path):
+    """
+    Yield articles from a file shaped like metadata_test.json
+    ({source_name: [article, ...]}). The whole file is parsed at once,
+    so use JSON-lines for large dumps.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    for source_name, articles in data.items():
+        for article in articles:
+            article.setdefault('source', source_name)
+            yield article
+
+def iter_records(path):
+    """Pick a reader based on file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.ndjson'):
+        return iter_jsonl(path)
+    if ext == '.csv':
+        return iter_csv(path)
+    if ext == '.json':
+        return iter_json(path)
+    raise ValueError(f"Unsupported file type: {path}")
+
+# ========================================
+# ROW CONVERSION
+# ========================================
+
+def clean_value(value):
+    """Map the placeholder values used in feed dumps to None"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        value = str(value)
+    value = value.strip()
+    return None if value in MISSING_VALUES else value
+
+def parse_states(value):
+    """Normalise states_mentioned (list or '|'/',' separated string)"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        separator = '|' if '|' in value else ','
+        value = value.split(separator)
+    states = [s.strip() for s in value if clean_value(s)]
+    return '|'.join(states) if states else None
+
+def record_to_row(record):
+    """
+    Convert a metadata_test.json style dict into a COPY staging row.
+    The published and scraped_at dates are passed through as text
+    and parsed by PostgreSQL during the merge.
+    """
+    get = record.get
+    return (
+        clean_value(get('title')),
+        clean_value(get('link') or get('url')),
+        clean_value(get('description')),
+        clean_value(get('published') or get('published_date')),
+        clean_value(get('source') or get('source_name')),
+        clean_value(get('author')),
+        clean_value(get('category')),
+        clean_value(get('scraped_at')),
+        clean_value(get('image_url')),
+        parse_states(get('states_mentioned')),
+    )
+
+# ========================================
+# IMPORT / EXPORT
+# ========================================
+
+def backfill_file(db, path, batch_size=50000):
+    """Load one dump file into the database with COPY"""
+    rows = (record_to_row(record) for record in iter_records(path))
+    return db.copy_articles_from(rows, batch_size=batch_size)
+
+def export_csv(db, path, since=None, before=None):
+    """Export articles to CSV via COPY TO"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        return db.copy_articles_to(f, since=since, before=before)
+
+def export_parquet(db, path, chunk_size=50000, since=None, before=None):
+    """
+    Export articles to Parquet, writing one row group per chunk
+    fetched from a server-side cursor
+
+    Returns: number of rows written, or None on failure
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("❌ pyarrow not installed!")
+        print("  Install with: pip install pyarrow")
+        return None
+
+    schema = pa.schema([
+        (name, pa.timestamp('us') if name in ('published', 'scraped_at') else pa.string())
+        for name in EXPORT_COLUMNS
+    ])
+
+    total = 0
+    try:
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            for columns, rows in db.iter_articles(chunk_size, since=since, before=before):
+                data = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+                writer.write_table(pa.Table.from_pydict(data, schema=schema))
+                total += len(rows)
+        return total
+    except Exception as e:
+        print(f"❌ Parquet export error: {e}")
+        return None
@@ -21,6 +21,17 @@ class Config:
     SCRAPE_INTERVAL_HOURS = int(os.getenv('SCRAPE_INTERVAL_HOURS', 1))
     MAX_ARTICLES_PER_SOURCE = int(os.getenv('MAX_ARTICLES_PER_SOURCE', 50))
     
+    ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 180))
+    ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
+    MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', 5000))
+    
+    ENRICH_IMAGES = os.getenv('ENRICH_IMAGES', 'False') == 'True'
+    IMAGE_MAX_WORKERS = int(os.getenv('IMAGE_MAX_WORKERS', 16))
+    IMAGE_PER_HOST = int(os.getenv('IMAGE_PER_HOST', 4))
+    IMAGE_TIMEOUT = int(os.getenv('IMAGE_TIMEOUT', 10))
+    IMAGE_BATCH_SIZE = int(os.getenv('IMAGE_BATCH_SIZE', 500))
+    IMAGE_STAGE_SECONDS = int(os.getenv('IMAGE_STAGE_SECONDS', 60))
+    
     MALAYSIAN_STATES = [
         'Johor', 'Kedah', 'Kelantan', 'Melaka', 'Negeri Sembilan',
         'Pahang', 'Penang', 'Perak', 'Perlis', 'Sabah', 'Sarawak',
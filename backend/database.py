@@ -3,11 +3,83 @@ Database Operations
 Handles all database connections and queries
 """
 
+import re
+import time
+import hashlib
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import errors
+from itertools import islice
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 from backend.config import db_config
 
+
+def copy_text_value(value):
+    """Escape one value for COPY's text format (None becomes \\N)"""
+    if value is None:
+        return '\\N'
+    if '\\' in value:
+        value = value.replace('\\', '\\\\')
+    if '\t' in value:
+        value = value.replace('\t', '\\t')
+    if '\n' in value:
+        value = value.replace('\n', '\\n')
+    if '\r' in value:
+        value = value.replace('\r', '\\r')
+    return value
+
+def url_hashes(urls):
+    """md5 hex digests matching PostgreSQL's md5(text), for the URL hash indexes"""
+    return [hashlib.md5(url.encode('utf-8')).hexdigest() for url in urls]
+
+def count_removed_tuples(table, notices):
+    """Sum the dead tuples VACUUM VERBOSE reports removing from table"""
+    # PG15+: 'finished vacuuming "db.public.t": ... tuples: N removed'
+    # older / FULL: '"t": found N removable'
+    pattern = re.compile(
+        rf'"(?:[\w.]*\.)?{re.escape(table)}".*?(?:tuples: (\d+) removed|found (\d+) removable)',
+        re.DOTALL
+    )
+    removed = 0
+    for notice in notices:
+        match = pattern.search(notice)
+        if match:
+            removed += int(match.group(1) or match.group(2))
+    return removed
+
+class CopyRowStream:
+    """
+    File-like wrapper that feeds an iterator of string/None row tuples
+    to COPY FROM in text format, encoding a block of rows at a time as
+    psycopg2 reads
+    """
+    
+    ROWS_PER_BLOCK = 2000
+    
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.pending = ''
+        self.offset = 0
+        self.count = 0
+    
+    def read(self, size=-1):
+        if self.offset >= len(self.pending):
+            self._fill()
+        if size < 0:
+            size = len(self.pending)
+        chunk = self.pending[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+    
+    def _fill(self):
+        block = list(islice(self.rows, self.ROWS_PER_BLOCK))
+        self.count += len(block)
+        self.pending = ''.join([
+            '\t'.join([copy_text_value(value) for value in row]) + '\n'
+            for row in block
+        ])
+        self.offset = 0
+
 class Database:
     """Database connection and operations manager"""
     
@@ -41,6 +113,7 @@ class Database:
             return self.cursor.fetchall()
         except Exception as e:
             print(f"❌ Query error: {e}")
+            self.conn.rollback()
             return []
     
     def execute_update(self, query, params=None):
@@ -136,6 +209,86 @@ class Database:
         """
         return self.execute_query(query, (limit,))
     
+    # ========================================
+    # IMAGE OPERATIONS
+    # ========================================
+    
+    def get_cached_image_urls(self, urls):
+        """
+        Which of urls already have metadata in the cache (failed
+        lookups count for a day, then get retried)
+        """
+        query = """
+            SELECT url
+            FROM image_metadata
+            WHERE md5(url) = ANY(%s)
+              AND (status = 'ok' OR resolved_at > NOW() - INTERVAL '1 day')
+        """
+        rows = self.execute_query(query, (url_hashes(urls),))
+        return {row['url'] for row in rows}
+    
+    def get_articles_missing_image_metadata(self, after_id=0, limit=500):
+        """Next page (by ID) of articles with an image but no metadata yet"""
+        query = """
+            SELECT id, image_url
+            FROM articles
+            WHERE id > %s
+              AND image_url IS NOT NULL
+              AND image_content_type IS NULL
+            ORDER BY id
+            LIMIT %s
+        """
+        return self.execute_query(query, (after_id, limit))
+    
+    def save_image_metadata(self, metadata):
+        """Store resolved image metadata in the URL cache"""
+        rows = [
+            (m['url'], m['content_type'], m['byte_size'], m['width'], m['height'], m['status'])
+            for m in metadata
+        ]
+        try:
+            execute_values(self.cursor, """
+                INSERT INTO image_metadata
+                (url, content_type, byte_size, width, height, status)
+                VALUES %s
+                ON CONFLICT ((md5(url))) DO UPDATE SET
+                    content_type = EXCLUDED.content_type,
+                    byte_size = EXCLUDED.byte_size,
+                    width = EXCLUDED.width,
+                    height = EXCLUDED.height,
+                    status = EXCLUDED.status,
+                    resolved_at = NOW()
+            """, rows)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"❌ Error saving image metadata: {e}")
+            self.conn.rollback()
+            return False
+    
+    def apply_image_metadata(self, urls):
+        """
+        Copy cached image metadata onto the articles using these URLs
+        
+        Only image_* columns are set, so the articles_updated_at
+        trigger (UPDATE OF content columns) does not fire.
+        """
+        query = """
+            UPDATE articles a
+            SET image_content_type = im.content_type,
+                image_bytes = im.byte_size,
+                image_width = im.width,
+                image_height = im.height
+            FROM image_metadata im
+            WHERE md5(im.url) = ANY(%s)
+              AND md5(a.image_url) = md5(im.url)
+              AND a.image_url = im.url
+              AND im.status = 'ok'
+              AND (a.image_content_type, a.image_bytes, a.image_width, a.image_height)
+                  IS DISTINCT FROM (im.content_type, im.byte_size, im.width, im.height)
+        """
+        return self.execute_update(query, (url_hashes(urls),))
+    
     # ========================================
     # STATE OPERATIONS
     # ========================================
@@ -196,4 +349,377 @@ class Database:
         """
         stats['articles_per_source'] = self.execute_query(query)
         
-        return stats
\ No newline at end of file
+        return stats
+    
+    # ========================================
+    # BULK OPERATIONS
+    # ========================================
+    
+    STAGING_COLUMNS = (
+        'title', 'url', 'description', 'published', 'source_name',
+        'author', 'category', 'scraped_at', 'image_url', 'states'
+    )
+    
+    # Date used for exports and retention; articles whose feed gave no
+    # usable published date fall back to when they were scraped
+    ARTICLE_DATE = "COALESCE({alias}published_date, {alias}scraped_at)"
+    
+    EXPORT_QUERY = """
+        SELECT
+            a.title, a.url AS link, a.description,
+            a.published_date AS published, s.name AS source,
+            a.author, a.category, a.scraped_at, a.image_url,
+            (
+                SELECT string_agg(st.name, '|' ORDER BY st.name)
+                FROM article_states ast
+                JOIN states st ON st.id = ast.state_id
+                WHERE ast.article_id = a.id
+            ) AS states_mentioned
+        FROM articles a
+        LEFT JOIN sources s ON a.source_id = s.id
+        {where}
+        ORDER BY a.id
+    """
+    
+    def copy_articles_from(self, rows, batch_size=50000):
+        """
+        Bulk load article rows with COPY FROM
+        
+        rows: iterable of tuples ordered like STAGING_COLUMNS, with
+        published/scraped_at as raw date strings and states as a '|'
+        separated string of state names. Dates are parsed server side,
+        as timestamptz like the live scraper's aware datetimes, so both
+        paths land in the same session time zone. Articles whose source
+        name isn't in sources are still saved, with no source, and
+        counted in unknown_source.
+        Each batch is copied into a temp staging table and merged into
+        articles/article_states in its own transaction, so memory and
+        lock time stay bounded however large the input is.
+        
+        Returns: dict with rows_read, articles_inserted, states_linked,
+        unknown_source
+        """
+        stats = {
+            'rows_read': 0, 'articles_inserted': 0,
+            'states_linked': 0, 'unknown_source': 0
+        }
+        columns = ', '.join(self.STAGING_COLUMNS)
+        rows = iter(rows)
+        
+        try:
+            self.cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS staging_articles (
+                    title TEXT, url TEXT, description TEXT,
+                    published TEXT, source_name TEXT, author TEXT,
+                    category TEXT, scraped_at TEXT, image_url TEXT, states TEXT
+                )
+            """)
+            self._create_parse_timestamp()
+            self.conn.commit()
+            
+            while True:
+                stream = CopyRowStream(islice(rows, batch_size))
+                self.cursor.execute("TRUNCATE staging_articles")
+                self.cursor.copy_expert(
+                    f"COPY staging_articles ({columns}) FROM STDIN",
+                    stream,
+                    size=1 << 20
+                )
+                if stream.count == 0:
+                    self.conn.commit()
+                    break
+                
+                # Historical rows never overwrite what the live scraper saved,
+                # and states are linked from RETURNING so existing articles
+                # are never scanned
+                self.cursor.execute("SET LOCAL work_mem = '64MB'")
+                self.cursor.execute("""
+                    WITH inserted AS (
+                        INSERT INTO articles
+                        (title, url, description, published_date, source_id,
+                         author, category, image_url, scraped_at)
+                        SELECT stg.title, stg.url, stg.description,
+                               pg_temp.parse_timestamp(stg.published),
+                               s.id, LEFT(stg.author, 200), LEFT(stg.category, 100),
+                               stg.image_url,
+                               COALESCE(pg_temp.parse_timestamp(stg.scraped_at), NOW())
+                        FROM staging_articles stg
+                        LEFT JOIN sources s ON s.name = stg.source_name
+                        WHERE stg.url IS NOT NULL AND stg.title IS NOT NULL
+                        ON CONFLICT (url) DO NOTHING
+                        RETURNING id, url, source_id
+                    ),
+                    linked AS (
+                        INSERT INTO article_states (article_id, state_id)
+                        SELECT DISTINCT i.id, st.id
+                        FROM inserted i
+                        JOIN staging_articles stg ON stg.url = i.url
+                        CROSS JOIN LATERAL unnest(string_to_array(stg.states, '|')) AS m(name)
+                        JOIN states st ON st.name = m.name
+                        ON CONFLICT (article_id, state_id) DO NOTHING
+                        RETURNING 1
+                    )
+                    SELECT
+                        (SELECT COUNT(*) FROM inserted) AS articles_inserted,
+                        (SELECT COUNT(*) FROM linked) AS states_linked,
+                        (SELECT COUNT(*) FROM inserted WHERE source_id IS NULL) AS unknown_source
+                """)
+                result = self.cursor.fetchone()
+                for key in ('articles_inserted', 'states_linked', 'unknown_source'):
+                    stats[key] += result[key]
+                
+                self.conn.commit()
+                stats['rows_read'] += stream.count
+                
+                if stream.count < batch_size:
+                    break
+            
+            return stats
+        except Exception as e:
+            print(f"❌ Bulk load error: {e}")
+            self.conn.rollback()
+            return None
+    
+    def _create_parse_timestamp(self):
+        """
+        Create pg_temp.parse_timestamp(text), which returns NULL for
+        empty or unparseable dates instead of failing the batch
+        """
+        if self.conn.server_version >= 160000:
+            # Plain SQL so it inlines into the merge, no per-row subtransaction
+            self.cursor.execute("""
+                CREATE OR REPLACE FUNCTION pg_temp.parse_timestamp(value TEXT)
+                RETURNS TIMESTAMPTZ AS $$
+                    SELECT CASE WHEN pg_input_is_valid(value, 'timestamptz')
+                                THEN value::timestamptz END
+                $$ LANGUAGE sql STABLE
+            """)
+        else:
+            # pg_input_is_valid needs PostgreSQL 16; older servers pay
+            # for an exception block per row
+            self.cursor.execute("""
+                CREATE OR REPLACE FUNCTION pg_temp.parse_timestamp(value TEXT)
+                RETURNS TIMESTAMPTZ AS $$
+                BEGIN
+                    RETURN NULLIF(value, '')::timestamptz;
+                EXCEPTION WHEN others THEN
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql STABLE
+            """)
+    
+    def _export_where(self, since=None, before=None, max_id=None):
+        """Build the WHERE clause for article exports"""
+        conditions = []
+        params = []
+        if since:
+            conditions.append(f"{self.ARTICLE_DATE.format(alias='a.')} >= %s")
+            params.append(since)
+        if before:
+            conditions.append(f"{self.ARTICLE_DATE.format(alias='a.')} < %s")
+            params.append(before)
+        if max_id is not None:
+            conditions.append("a.id <= %s")
+            params.append(max_id)
+        if not conditions:
+            return "", params
+        return "WHERE " + " AND ".join(conditions), params
+    
+    def copy_articles_to(self, file_obj, since=None, before=None, max_id=None):
+        """
+        Stream articles to a file object as CSV with COPY TO
+        
+        Output columns match metadata_test.json so exports can be
+        loaded back with copy_articles_from.
+        """
+        where, params = self._export_where(since, before, max_id)
+        query = self.EXPORT_QUERY.format(where=where)
+        # COPY does not take bind parameters, so inline them safely
+        query = self.cursor.mogrify(query, params).decode()
+        
+        try:
+            self.cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)",
+                file_obj
+            )
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"❌ Export error: {e}")
+            self.conn.rollback()
+            return False
+    
+    def iter_articles(self, chunk_size=50000, since=None, before=None):
+        """
+        Stream articles with a server-side named cursor
+        
+        Yields: (column_names, rows) per chunk of at most chunk_size tuples
+        """
+        where, params = self._export_where(since, before)
+        query = self.EXPORT_QUERY.format(where=where)
+        cursor = self.conn.cursor(name='article_export')
+        cursor.itersize = chunk_size
+        
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [col.name for col in cursor.description], rows
+        finally:
+            cursor.close()
+            self.conn.commit()
+    
+    # ========================================
+    # MAINTENANCE
+    # ========================================
+    
+    def get_max_article_id(self, before):
+        """
+        Highest article ID dated before a cutoff (None if none)
+        
+        Unlike execute_query, errors are raised so a failed lookup is
+        never mistaken for "nothing to archive".
+        """
+        query = f"""
+            SELECT MAX(id) AS max_id FROM articles
+            WHERE {self.ARTICLE_DATE.format(alias='')} < %s
+        """
+        try:
+            self.cursor.execute(query, (before,))
+            return self.cursor.fetchone()['max_id']
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def delete_articles_before(self, before, max_id, batch_size=5000, lock_retries=5):
+        """
+        Delete old articles in small batches, one transaction each
+        
+        Rows locked by a running scrape are skipped rather than waited
+        on, and article_states/article_keywords go with them via
+        ON DELETE CASCADE. A batch that hits lock_timeout on the
+        cascade is retried up to lock_retries times in a row.
+        
+        Returns: number of articles deleted
+        """
+        query = f"""
+            DELETE FROM articles
+            WHERE id IN (
+                SELECT id FROM articles
+                WHERE {self.ARTICLE_DATE.format(alias='')} < %s AND id <= %s
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+        """
+        total = 0
+        failures = 0
+        while True:
+            try:
+                self.cursor.execute("SET LOCAL lock_timeout = '2s'")
+                self.cursor.execute(query, (before, max_id, batch_size))
+                deleted = self.cursor.rowcount
+                self.conn.commit()
+            except errors.LockNotAvailable as e:
+                self.conn.rollback()
+                failures += 1
+                if failures > lock_retries:
+                    print(f"❌ Delete gave up after {lock_retries} lock timeouts: {e}")
+                    break
+                print(f"  ⚠️  Lock timeout, retrying batch ({failures}/{lock_retries})")
+                time.sleep(failures)
+                continue
+            except Exception as e:
+                print(f"❌ Delete error: {e}")
+                self.conn.rollback()
+                break
+            
+            failures = 0
+            total += deleted
+            # SKIP LOCKED can return short batches, so only an empty
+            # batch means nothing unlocked is left
+            if deleted == 0:
+                break
+        
+        return total
+    
+    def refresh_keyword_counts(self):
+        """Recompute keywords.total_count, touching only rows that changed"""
+        query = """
+            UPDATE keywords k
+            SET total_count = agg.total
+            FROM (
+                SELECT kw.id, COALESCE(SUM(ak.frequency), 0) AS total
+                FROM keywords kw
+                LEFT JOIN article_keywords ak ON ak.keyword_id = kw.id
+                GROUP BY kw.id
+            ) agg
+            WHERE agg.id = k.id AND k.total_count IS DISTINCT FROM agg.total
+        """
+        return self.execute_update(query)
+    
+    def get_table_stats(self, tables):
+        """Size and dead tuple counts for the given tables"""
+        # pg_stat views are cached per transaction, so start a fresh one
+        self.conn.commit()
+        query = """
+            SELECT
+                relname AS table_name,
+                pg_total_relation_size(relid) AS total_bytes,
+                pg_indexes_size(relid) AS index_bytes,
+                n_live_tup, n_dead_tup
+            FROM pg_stat_user_tables
+            WHERE relname = ANY(%s)
+            ORDER BY relname
+        """
+        return self.execute_query(query, (list(tables),))
+    
+    def run_maintenance_command(self, command):
+        """Run VACUUM/REINDEX, which cannot run inside a transaction"""
+        self.conn.commit()
+        previous = self.conn.autocommit
+        self.conn.autocommit = True
+        try:
+            self.cursor.execute(command)
+            return True
+        except Exception as e:
+            print(f"❌ Maintenance error: {e}")
+            return False
+        finally:
+            self.conn.autocommit = previous
+    
+    def vacuum_table(self, table, full=False):
+        """
+        VACUUM (ANALYZE) one table
+        
+        Returns: dead tuples removed, parsed from the VERBOSE output,
+        or None on error
+        """
+        options = "FULL, ANALYZE, VERBOSE" if full else "ANALYZE, VERBOSE"
+        del self.conn.notices[:]
+        if not self.run_maintenance_command(f"VACUUM ({options}) {table}"):
+            return None
+        
+        return count_removed_tuples(table, self.conn.notices)
+    
+    def get_free_space(self, tables):
+        """
+        Reusable free space inside each table in bytes, from
+        pgstattuple_approx. Returns None if pgstattuple isn't installed.
+        """
+        result = self.execute_query(
+            "SELECT 1 AS installed FROM pg_extension WHERE extname = 'pgstattuple'"
+        )
+        if not result:
+            return None
+        
+        free_space = {}
+        for table in tables:
+            result = self.execute_query(
+                "SELECT approx_free_space FROM pgstattuple_approx(%s::regclass)",
+                (table,)
+            )
+            free_space[table] = result[0]['approx_free_space'] if result else 0
+        return free_space
@@ -0,0 +1,342 @@
+"""
+Image Metadata Resolver
+Looks up content type, size and dimensions of article images with
+small range requests, so the frontend does not have to fetch them blind
+"""
+
+import time
+import struct
+import http.client
+from itertools import zip_longest
+from urllib.parse import urlsplit, urljoin, quote
+from concurrent.futures import ThreadPoolExecutor
+from backend.config import Config
+
+# Enough to reach the dimensions of almost any PNG/GIF/WebP/JPEG header
+PROBE_BYTES = 65536
+USER_AGENT = 'NewsAnalyzer/1.0 (image metadata)'
+MAX_REDIRECTS = 3
+# Longer URLs (usually inlined data or tracking junk) are never looked up
+MAX_URL_LENGTH = 2000
+# A lane gives up on its host after this many unreachable lookups in a row
+MAX_HOST_FAILURES = 3
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+# Leave existing escapes and reserved characters alone when quoting paths
+URL_SAFE = "/%:@!$&'()*+,;=~-._?"
+
+def parse_image_size(data):
+    """
+    Read (width, height) from the first bytes of a PNG, GIF, WebP
+    or JPEG file. Returns (None, None) if unknown.
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack('<HH', data[6:10])
+
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP' and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return width & 0x3fff, height & 0x3fff
+        if chunk == b'VP8L':
+            bits = int.from_bytes(data[21:25], 'little')
+            return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+        if chunk == b'VP8X':
+            width = int.from_bytes(data[24:27], 'little') + 1
+            height = int.from_bytes(data[27:30], 'little') + 1
+            return width, height
+
+    if data[:2] == b'\xff\xd8':
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xff:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker == 0xff:
+                i += 1
+                continue
+            if marker == 0xd8 or 0xd0 <= marker <= 0xd7:
+                i += 2
+                continue
+            # SOFn frames carry the dimensions (C4/C8/CC are other tables)
+            if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+                height, width = struct.unpack('>HH', data[i + 5:i + 9])
+                return width, height
+            length = struct.unpack('>H', data[i + 2:i + 4])[0]
+            i += 2 + length
+
+    return None, None
+
+def is_resolvable(url):
+    """Whether url is an http(s) URL short enough to look up and cache"""
+    if not url or len(url) > MAX_URL_LENGTH:
+        return False
+    parts = urlsplit(url)
+    return parts.scheme in ('http', 'https') and bool(parts.netloc)
+
+def failed_metadata(url):
+    """Metadata dict for a URL that could not be resolved"""
+    return {
+        'url': url,
+        'content_type': None,
+        'byte_size': None,
+        'width': None,
+        'height': None,
+        'status': 'error',
+    }
+
+class HostConnection:
+    """One keep-alive HTTP(S) connection to a single host"""
+
+    def __init__(self, scheme, netloc, timeout):
+        self.key = (scheme, netloc.lower())
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, method, target, headers):
+        """
+        Send one request, retrying once if a reused connection was
+        dropped by the server
+
+        Returns: (status, headers, first PROBE_BYTES of the body)
+        """
+        for _ in range(2):
+            fresh = self.conn is None
+            if fresh:
+                connection_class = (http.client.HTTPSConnection if self.scheme == 'https'
+                                    else http.client.HTTPConnection)
+                self.conn = connection_class(self.netloc, timeout=self.timeout)
+            try:
+                self.conn.request(method, target, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read(PROBE_BYTES)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if fresh:
+                    raise
+                continue
+
+            # Only keep the connection if the whole body was consumed
+            if not response.isclosed():
+                self.close()
+            return response.status, response.headers, data
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+class ImageResolver:
+    """
+    Concurrent image metadata lookups
+
+    URLs are grouped by host and split into at most per_host lanes.
+    Each lane runs on one pool thread with its own keep-alive
+    connection, so no thread ever waits on another host's limit.
+    """
+
+    def __init__(self, max_workers=None, per_host=None, timeout=None):
+        self.max_workers = max_workers or Config.IMAGE_MAX_WORKERS
+        self.per_host = per_host or Config.IMAGE_PER_HOST
+        self.timeout = timeout or Config.IMAGE_TIMEOUT
+
+    def _fetch(self, connection, url, method, headers=None):
+        """Request url, following redirects; reuses connection for its own host"""
+        request_headers = {'User-Agent': USER_AGENT}
+        request_headers.update(headers or {})
+
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            target = quote(parts.path or '/', safe=URL_SAFE)
+            if parts.query:
+                target += '?' + quote(parts.query, safe=URL_SAFE)
+
+            if (parts.scheme, parts.netloc.lower()) == connection.key:
+                status, response_headers, data = connection.request(method, target, request_headers)
+            else:
+                other = HostConnection(parts.scheme, parts.netloc, self.timeout)
+                try:
+                    status, response_headers, data = other.request(method, target, request_headers)
+                finally:
+                    other.close()
+
+            location = response_headers.get('Location')
+            if status in REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                continue
+            return status, response_headers, data
+
+        raise http.client.HTTPException("Too many redirects")
+
+    def _probe(self, connection, url):
+        """Range request for the first bytes; falls back to HEAD"""
+        headers = {'Range': f'bytes=0-{PROBE_BYTES - 1}'}
+        status, response_headers, data = self._fetch(connection, url, 'GET', headers)
+
+        if status in (405, 416, 501):
+            status, response_headers, _ = self._fetch(connection, url, 'HEAD')
+            data = b''
+        if status >= 400:
+            raise http.client.HTTPException(f"HTTP {status}")
+
+        byte_size = None
+        content_range = response_headers.get('Content-Range', '')
+        content_length = response_headers.get('Content-Length', '')
+        if status == 206 and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            byte_size = int(total) if total.isdigit() else None
+        elif content_length.isdigit():
+            byte_size = int(content_length)
+        return response_headers.get('Content-Type'), byte_size, data
+
+    def _resolve_with(self, connection, url):
+        """
+        Resolve one URL over an existing host connection
+
+        Returns: (metadata, unreachable), where unreachable means the
+        host could not be connected to or timed out
+        """
+        try:
+            content_type, byte_size, data = self._probe(connection, url)
+        except Exception as e:
+            connection.close()
+            print(f"  ⚠️  Image lookup failed: {url} ({e})")
+            return failed_metadata(url), isinstance(e, OSError)
+
+        if content_type:
+            content_type = content_type.split(';')[0].strip().lower()
+        width, height = parse_image_size(data)
+
+        metadata = failed_metadata(url)
+        metadata.update({
+            'content_type': content_type,
+            'byte_size': byte_size,
+            'width': width,
+            'height': height,
+            'status': 'ok',
+        })
+        return metadata, False
+
+    def _resolve_lane(self, host, urls, deadline=None):
+        """
+        Resolve a run of same-host URLs over one connection
+
+        Stops at the deadline (time.monotonic() value), leaving the
+        rest out of the results, and gives up on the host after
+        MAX_HOST_FAILURES unreachable lookups in a row, marking the
+        rest as errors.
+        """
+        scheme, netloc = host
+        connection = HostConnection(scheme, netloc, self.timeout)
+        results = []
+        failures = 0
+        try:
+            for i, url in enumerate(urls):
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if failures >= MAX_HOST_FAILURES:
+                    print(f"  ⚠️  Giving up on {netloc} after {failures} failed lookups")
+                    results.extend(failed_metadata(rest) for rest in urls[i:])
+                    break
+                metadata, unreachable = self._resolve_with(connection, url)
+                failures = failures + 1 if unreachable else 0
+                results.append(metadata)
+            return results
+        finally:
+            connection.close()
+
+    def resolve(self, url):
+        """
+        Resolve one image URL
+
+        Returns: dict with url, content_type, byte_size, width, height
+        and status ('ok' or 'error')
+        """
+        parts = urlsplit(url)
+        return self._resolve_lane((parts.scheme, parts.netloc), [url])[0]
+
+    def resolve_many(self, urls, deadline=None):
+        """
+        Resolve unique URLs concurrently, returning a list of metadata
+        dicts. URLs not reached before the deadline (a time.monotonic()
+        value) are left out, so they are retried on a later run.
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return []
+
+        results = {}
+        by_host = {}
+        for url in unique_urls:
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https') or not parts.netloc:
+                results[url] = failed_metadata(url)
+                continue
+            by_host.setdefault((parts.scheme, parts.netloc.lower()), []).append(url)
+
+        # Split each host into per_host lanes and interleave hosts, so
+        # the pool works on many hosts at once instead of queueing on one
+        lanes_by_host = [
+            [(host, host_urls[i::self.per_host])
+             for i in range(min(self.per_host, len(host_urls)))]
+            for host, host_urls in by_host.items()
+        ]
+        lanes = [lane for group in zip_longest(*lanes_by_host) for lane in group if lane]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            lane_results = executor.map(lambda lane: self._resolve_lane(*lane, deadline), lanes)
+            for metadata_list in lane_results:
+                for metadata in metadata_list:
+                    results[metadata['url']] = metadata
+
+        return [results[url] for url in unique_urls if url in results]
+
+def enrich_images(db, urls, resolver=None, deadline=None):
+    """
+    Resolve the given image URLs that aren't cached yet, then copy
+    the cached metadata onto the articles using them. URLs that can't
+    be looked up (not http(s), or over MAX_URL_LENGTH) are skipped.
+
+    Returns: number of URLs looked up
+    """
+    urls = list(dict.fromkeys(url for url in urls if is_resolvable(url)))
+    if not urls:
+        return 0
+
+    cached = db.get_cached_image_urls(urls)
+    pending = [url for url in urls if url not in cached]
+    metadata = []
+    if pending:
+        resolver = resolver or ImageResolver()
+        metadata = resolver.resolve_many(pending, deadline)
+        if metadata and not db.save_image_metadata(metadata):
+            return 0
+
+    db.apply_image_metadata(urls)
+    return len(metadata)
+
+def enrich_backlog(db, resolver=None, batch_size=None):
+    """
+    Walk every article still missing image metadata once, in ID
+    order, resolving a batch at a time
+
+    Returns: number of URLs looked up
+    """
+    resolver = resolver or ImageResolver()
+    batch_size = batch_size or Config.IMAGE_BATCH_SIZE
+    last_id = 0
+    resolved = 0
+
+    while True:
+        rows = db.get_articles_missing_image_metadata(last_id, batch_size)
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+        resolved += enrich_images(db, [row['image_url'] for row in rows], resolver)
+
+    return resolved
@@ -0,0 +1,133 @@
+"""
+Database Maintenance
+Archives old articles, deletes them in bounded batches and keeps
+tables and indexes compact
+"""
+
+import os
+import gzip
+import time
+import statistics
+from datetime import datetime, timedelta
+from backend.config import Config
+
+TABLES = ('articles', 'article_states', 'keywords', 'article_keywords')
+REINDEX_TABLES = ('articles', 'article_states')
+
+class DatabaseMaintenance:
+    """Retention, archival and index maintenance for the articles store"""
+
+    def __init__(self, db, max_age_days=None, archive_dir=None, batch_size=None):
+        self.db = db
+        self.max_age_days = Config.ARCHIVE_AFTER_DAYS if max_age_days is None else max_age_days
+        self.archive_dir = Config.ARCHIVE_DIR if archive_dir is None else archive_dir
+        self.batch_size = Config.MAINTENANCE_BATCH_SIZE if batch_size is None else batch_size
+        if self.max_age_days < 0:
+            raise ValueError("max_age_days must be 0 or more")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+    def measure_latency(self, runs=5):
+        """Median latency in ms of the queries the app runs most"""
+        queries = {
+            'recent_articles': self.db.get_recent_articles,
+            'state_trends': self.db.get_state_trends,
+            'statistics': self.db.get_statistics,
+        }
+        latency = {}
+        for name, query in queries.items():
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                query()
+                timings.append((time.perf_counter() - start) * 1000)
+            latency[name] = statistics.median(timings)
+        return latency
+
+    def table_sizes(self):
+        """Table stats keyed by table name"""
+        return {row['table_name']: row for row in self.db.get_table_stats(TABLES)}
+
+    def archive_articles(self, cutoff, max_id):
+        """
+        Write articles older than cutoff to a gzipped CSV
+
+        Returns: archive path, or None on failure
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        filename = f"articles_before_{cutoff:%Y%m%d}_{datetime.now():%Y%m%d%H%M%S}.csv.gz"
+        path = os.path.join(self.archive_dir, filename)
+
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+            ok = self.db.copy_articles_to(f, before=cutoff, max_id=max_id)
+
+        if not ok:
+            os.remove(path)
+            return None
+        return path
+
+    def run(self, reindex=False, vacuum_full=False, dry_run=False):
+        """
+        Archive and delete old articles, then vacuum and analyze
+
+        vacuum_full returns space to the OS, but VACUUM FULL holds an
+        exclusive lock on each table, so it blocks a running scrape.
+
+        Returns: report dict, or None if archiving failed
+        """
+        cutoff = datetime.now() - timedelta(days=self.max_age_days)
+        report = {
+            'cutoff': cutoff,
+            'archive_path': None,
+            'articles_deleted': 0,
+            'dead_tuples_removed': 0,
+            'vacuum_full': vacuum_full and not dry_run,
+            'sizes_before': self.table_sizes(),
+            'free_before': self.db.get_free_space(TABLES),
+            'latency_before': self.measure_latency(),
+        }
+
+        # Pin the ID range now so rows backfilled mid-run are never
+        # deleted without having been archived first
+        try:
+            max_id = self.db.get_max_article_id(cutoff)
+        except Exception as e:
+            print(f"\n❌ Cannot look up articles to archive: {e}")
+            return None
+
+        if max_id is None:
+            print(f"\n✓ No articles older than {cutoff:%Y-%m-%d}")
+        elif dry_run:
+            print(f"\n🔍 Dry run: would archive articles up to ID {max_id}")
+        else:
+            print(f"\n📦 Archiving articles dated before {cutoff:%Y-%m-%d}...")
+            report['archive_path'] = self.archive_articles(cutoff, max_id)
+            if not report['archive_path']:
+                print("  ❌ Archive failed, nothing deleted")
+                return None
+            print(f"  ✓ Archived to {report['archive_path']}")
+
+            print(f"\n🗑️  Deleting in batches of {self.batch_size}...")
+            report['articles_deleted'] = self.db.delete_articles_before(
+                cutoff, max_id, self.batch_size
+            )
+            print(f"  ✓ Deleted {report['articles_deleted']} articles")
+
+            self.db.refresh_keyword_counts()
+
+        if not dry_run:
+            label = "VACUUM FULL" if vacuum_full else "Vacuuming and analyzing"
+            print(f"\n🧹 {label}...")
+            for table in TABLES:
+                removed = self.db.vacuum_table(table, full=vacuum_full)
+                report['dead_tuples_removed'] += removed or 0
+
+            if reindex:
+                print("\n🔧 Rebuilding indexes...")
+                for table in REINDEX_TABLES:
+                    self.db.run_maintenance_command(f"REINDEX TABLE CONCURRENTLY {table}")
+
+        report['sizes_after'] = self.table_sizes()
+        report['free_after'] = self.db.get_free_space(TABLES)
+        report['latency_after'] = self.measure_latency()
+        return report
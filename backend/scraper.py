@@ -3,11 +3,13 @@ RSS News Scraper
 Scrapes metadata from RSS feeds and saves to database
 """
 
+import time
 import feedparser
 from datetime import datetime
 from dateutil import parser as date_parser
 from backend.database import Database
 from backend.config import Config
+from backend.image_resolver import enrich_images
 
 class NewsScraper:
     """RSS news scraper with database integration"""
@@ -141,6 +143,7 @@ class NewsScraper:
                 'articles_saved': 0,
                 'errors': 0
             }
+            image_urls = []
             
             # Scrape each source
             for source in sources:
@@ -160,6 +163,8 @@ class NewsScraper:
                     for article in articles:
                         if self.save_article_to_db(article):
                             saved_count += 1
+                            if article['image_url']:
+                                image_urls.append(article['image_url'])
                         else:
                             stats['errors'] += 1
                     
@@ -174,6 +179,11 @@ class NewsScraper:
                     self.db.increment_source_error(source_id)
                     stats['errors'] += 1
             
+            # Optional image enrichment for this run's articles only;
+            # older backlogs are left to scripts/resolve_images.py
+            if Config.ENRICH_IMAGES:
+                stats['images_resolved'] = self.enrich_images(image_urls)
+            
             # Print summary
             print("\n" + "="*60)
             print("✅ SCRAPING COMPLETE")
@@ -192,6 +202,21 @@ class NewsScraper:
         finally:
             self.db.disconnect()
     
+    def enrich_images(self, image_urls):
+        """Resolve image metadata; failures never affect the scrape"""
+        print("\n🖼️  Resolving image metadata...")
+        try:
+            # Capped in URLs and wall-clock time; lookups already in
+            # flight at the deadline are still bounded by IMAGE_TIMEOUT
+            budget = list(dict.fromkeys(image_urls))[:Config.IMAGE_BATCH_SIZE]
+            deadline = time.monotonic() + Config.IMAGE_STAGE_SECONDS
+            resolved = enrich_images(self.db, budget, deadline=deadline)
+            print(f"  ✓ Resolved {resolved} new image URLs")
+            return resolved
+        except Exception as e:
+            print(f"  ⚠️  Image enrichment failed: {e}")
+            return 0
+    
     def get_statistics(self):
         """Get overall database statistics"""
         if not self.db.connect():
@@ -0,0 +1,54 @@
+"""
+Database Migration Script
+Applies the idempotent migrations in database/migrations to an
+existing database without touching its data
+"""
+
+import os
+import sys
+import psycopg2
+from setup_database import get_db_config, run_sql_file
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+def migrate_database():
+    """Run every migration file in order"""
+    print("\n" + "="*60)
+    print("🔄 MIGRATING DATABASE")
+    print("="*60)
+    
+    db_config = get_db_config()
+    
+    try:
+        print(f"\n📡 Connecting to database: {db_config['database']}")
+        conn = psycopg2.connect(**db_config)
+        conn.autocommit = True
+        cursor = conn.cursor()
+        print("  ✓ Connected to database")
+        
+        print("\n📋 Applying migrations...")
+        for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+            if not filename.endswith('.sql'):
+                continue
+            if not run_sql_file(cursor, os.path.join(MIGRATIONS_DIR, filename)):
+                print("\n❌ Migration failed")
+                return False
+        
+        cursor.close()
+        conn.close()
+        
+        print("\n" + "="*60)
+        print("✅ DATABASE MIGRATED!")
+        print("="*60 + "\n")
+        return True
+        
+    except psycopg2.OperationalError as e:
+        print(f"\n❌ Database connection error: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    sys.exit(0 if success else 1)
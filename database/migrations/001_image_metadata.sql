@@ -0,0 +1,36 @@
+-- Image metadata enrichment
+-- Safe to run repeatedly on an existing database
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS image_content_type VARCHAR(100);
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS image_bytes BIGINT;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS image_width INT;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS image_height INT;
+
+CREATE TABLE IF NOT EXISTS image_metadata (
+    url TEXT NOT NULL,
+    content_type VARCHAR(100),
+    byte_size BIGINT,
+    width INT,
+    height INT,
+    status VARCHAR(10) NOT NULL,
+    resolved_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMENT ON TABLE image_metadata IS 'Cache of resolved image URLs, shared across articles and runs';
+
+-- URLs can exceed the ~2.7KB btree entry limit, so index their hashes
+ALTER TABLE image_metadata DROP CONSTRAINT IF EXISTS image_metadata_pkey;
+ALTER TABLE image_metadata ALTER COLUMN url SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_image_metadata_url_hash ON image_metadata(md5(url));
+
+DROP INDEX IF EXISTS idx_articles_image_url;
+CREATE INDEX IF NOT EXISTS idx_articles_image_url_hash ON articles(md5(image_url));
+
+-- Only content columns bump updated_at; image metadata enrichment doesn't
+DROP TRIGGER IF EXISTS articles_updated_at ON articles;
+CREATE TRIGGER articles_updated_at
+    BEFORE UPDATE OF title, url, description, published_date, source_id,
+                     author, category, image_url
+    ON articles
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at();
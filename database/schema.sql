@@ -2,6 +2,7 @@ DROP TABLE IF EXISTS article_keywords CASCADE;
 DROP TABLE IF EXISTS keywords CASCADE;
 DROP TABLE IF EXISTS article_states CASCADE;
 DROP TABLE IF EXISTS articles CASCADE;
+DROP TABLE IF EXISTS image_metadata CASCADE;
 DROP TABLE IF EXISTS states CASCADE;
 DROP TABLE IF EXISTS sources CASCADE;
 
@@ -41,6 +42,10 @@ CREATE TABLE articles (
     author VARCHAR(200),
     category VARCHAR(100),
     image_url TEXT,
+    image_content_type VARCHAR(100),
+    image_bytes BIGINT,
+    image_width INT,
+    image_height INT,
     
     -- Timestamps
     scraped_at TIMESTAMP DEFAULT NOW(),
@@ -49,6 +54,21 @@ CREATE TABLE articles (
 
 COMMENT ON TABLE articles IS 'Scraped news articles with metadata';
 
+CREATE TABLE image_metadata (
+    url TEXT NOT NULL,
+    content_type VARCHAR(100),
+    byte_size BIGINT,
+    width INT,
+    height INT,
+    status VARCHAR(10) NOT NULL,
+    resolved_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMENT ON TABLE image_metadata IS 'Cache of resolved image URLs, shared across articles and runs';
+
+-- Keyed on a hash: btree entries are capped at ~2.7KB and URLs aren't
+CREATE UNIQUE INDEX idx_image_metadata_url_hash ON image_metadata(md5(url));
+
 CREATE TABLE article_states (
     article_id INT REFERENCES articles(id) ON DELETE CASCADE,
     state_id INT REFERENCES states(id) ON DELETE CASCADE,
@@ -75,6 +95,7 @@ CREATE TABLE article_keywords (
 CREATE INDEX idx_articles_published ON articles(published_date DESC);
 CREATE INDEX idx_articles_source ON articles(source_id);
 CREATE INDEX idx_articles_scraped ON articles(scraped_at DESC);
+CREATE INDEX idx_articles_image_url_hash ON articles(md5(image_url));
 CREATE INDEX idx_article_states_state ON article_states(state_id);
 CREATE INDEX idx_article_states_article ON article_states(article_id);
 CREATE INDEX idx_keywords_word ON keywords(word);
@@ -87,8 +108,11 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Only content columns bump updated_at; image metadata enrichment doesn't
 CREATE TRIGGER articles_updated_at
-    BEFORE UPDATE ON articles
+    BEFORE UPDATE OF title, url, description, published_date, source_id,
+                     author, category, image_url
+    ON articles
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at();
 
@@ -0,0 +1,66 @@
+"""
+Backfill Articles
+Bulk load archived feed dumps (JSON-lines, CSV or metadata_test.json
+style) into the database using COPY
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Add parent directory to path so we can import backend modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Database
+from backend.bulk import backfill_file
+
+def main():
+    """Load every file given on the command line"""
+    parser = argparse.ArgumentParser(description="Bulk load archived feed dumps")
+    parser.add_argument('files', nargs='+', help=".jsonl, .csv or .json dump files")
+    parser.add_argument('--batch-size', type=int, default=50000,
+                        help="rows per COPY batch / transaction")
+    args = parser.parse_args()
+    
+    print("\n" + "="*60)
+    print("📥 HISTORICAL BACKFILL")
+    print("="*60)
+    
+    db = Database()
+    if not db.connect():
+        return 1
+    
+    failed = 0
+    try:
+        for path in args.files:
+            print(f"\n📂 Loading: {path}")
+            start = time.perf_counter()
+            
+            try:
+                stats = backfill_file(db, path, batch_size=args.batch_size)
+            except (OSError, ValueError) as e:
+                print(f"  ❌ Cannot read {path}: {e}")
+                stats = None
+            
+            if not stats:
+                failed += 1
+                continue
+            
+            elapsed = time.perf_counter() - start
+            rate = stats['rows_read'] / elapsed if elapsed else 0
+            print(f"  ✓ Rows read: {stats['rows_read']}")
+            print(f"  ✓ New articles: {stats['articles_inserted']}")
+            print(f"  ✓ State links: {stats['states_linked']}")
+            if stats['unknown_source']:
+                print(f"  ⚠️  {stats['unknown_source']} articles have a source not in "
+                      f"the sources table; they are saved without one and won't "
+                      f"appear in per-source views")
+            print(f"  ⏱  {elapsed:.1f}s ({rate:,.0f} rows/sec)")
+    finally:
+        db.disconnect()
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Export Articles
+Stream articles out of the database to CSV or Parquet
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Add parent directory to path so we can import backend modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Database
+from backend.bulk import export_csv, export_parquet
+
+def main():
+    """Export articles for offline analysis"""
+    parser = argparse.ArgumentParser(description="Export articles to CSV or Parquet")
+    parser.add_argument('output', help="output file (.csv or .parquet)")
+    parser.add_argument('--since', help="only articles dated on/after this date (scrape time if unpublished)")
+    parser.add_argument('--before', help="only articles dated before this date")
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                        help="rows fetched per round trip (Parquet only)")
+    args = parser.parse_args()
+    
+    print("\n" + "="*60)
+    print("📤 ARTICLE EXPORT")
+    print("="*60)
+    
+    db = Database()
+    if not db.connect():
+        return 1
+    
+    start = time.perf_counter()
+    try:
+        if args.output.lower().endswith('.parquet'):
+            rows = export_parquet(db, args.output, args.chunk_size,
+                                  since=args.since, before=args.before)
+            ok = rows is not None
+            if ok:
+                print(f"  ✓ Rows written: {rows}")
+        else:
+            ok = export_csv(db, args.output, since=args.since, before=args.before)
+    finally:
+        db.disconnect()
+    
+    if not ok:
+        print("\n❌ Export failed!")
+        return 1
+    
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"\n✅ Exported to {args.output} ({size_mb:.1f} MB in {elapsed:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
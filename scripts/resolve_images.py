@@ -0,0 +1,35 @@
+"""
+Resolve Images
+Fill in content type, size and dimensions for every article image
+still missing them (the scraper only resolves its own run's images)
+"""
+
+import sys
+import os
+
+# Add parent directory to path so we can import backend modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Database
+from backend.image_resolver import enrich_backlog
+
+def main():
+    """Resolve the image metadata backlog"""
+    print("\n" + "="*60)
+    print("🖼️  IMAGE METADATA")
+    print("="*60)
+    
+    db = Database()
+    if not db.connect():
+        return 1
+    
+    try:
+        resolved = enrich_backlog(db)
+    finally:
+        db.disconnect()
+    
+    print(f"\n✅ Resolved {resolved} image URLs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
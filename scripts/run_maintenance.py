@@ -0,0 +1,99 @@
+"""
+Run Maintenance
+Archive old articles, trim the tables and report reclaimed space.
+Safe to run while the scraper is running, except with --vacuum-full.
+"""
+
+import sys
+import os
+import argparse
+
+# Add parent directory to path so we can import backend modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Database
+from backend.maintenance import DatabaseMaintenance
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def print_report(report):
+    """Print space and latency changes"""
+    print("\n💾 Table sizes on disk:")
+    size_change = 0
+    for table, before in report['sizes_before'].items():
+        after = report['sizes_after'].get(table, before)
+        size_change += after['total_bytes'] - before['total_bytes']
+        print(f"  • {table}: {format_bytes(before['total_bytes'])} → "
+              f"{format_bytes(after['total_bytes'])} "
+              f"(dead tuples {before['n_dead_tup']} → {after['n_dead_tup']})")
+    print(f"  • On-disk size change: {format_bytes(size_change)}")
+    if not report['vacuum_full']:
+        print("    (plain VACUUM keeps freed pages for reuse; use --vacuum-full to shrink files)")
+    
+    print(f"\n♻️  Dead tuples removed by VACUUM: {report['dead_tuples_removed']}")
+    if report['free_before'] is not None and report['free_after'] is not None:
+        reusable = sum(report['free_after'].values()) - sum(report['free_before'].values())
+        print(f"  ✓ Reusable free space gained: {format_bytes(reusable)}")
+    else:
+        print("  • Install the pgstattuple extension to measure reusable free space")
+    
+    print("\n⏱  Query latency (median ms):")
+    for name, before in report['latency_before'].items():
+        after = report['latency_after'][name]
+        print(f"  • {name}: {before:.2f} → {after:.2f}")
+
+def main():
+    """Run the maintenance job"""
+    parser = argparse.ArgumentParser(description="Archive old articles and compact tables")
+    parser.add_argument('--max-age-days', type=int, help="archive articles older than this")
+    parser.add_argument('--archive-dir', help="where to write .csv.gz archives")
+    parser.add_argument('--batch-size', type=int, help="articles deleted per transaction")
+    parser.add_argument('--reindex', action='store_true', help="also REINDEX CONCURRENTLY")
+    parser.add_argument('--vacuum-full', action='store_true',
+                        help="VACUUM FULL to return space to the OS (locks tables, "
+                             "do not run alongside the scraper)")
+    parser.add_argument('--dry-run', action='store_true', help="report only, change nothing")
+    args = parser.parse_args()
+    
+    print("\n" + "="*60)
+    print("🧰 DATABASE MAINTENANCE")
+    print("="*60)
+    
+    db = Database()
+    if not db.connect():
+        return 1
+    
+    try:
+        maintenance = DatabaseMaintenance(
+            db,
+            max_age_days=args.max_age_days,
+            archive_dir=args.archive_dir,
+            batch_size=args.batch_size
+        )
+        report = maintenance.run(
+            reindex=args.reindex,
+            vacuum_full=args.vacuum_full,
+            dry_run=args.dry_run
+        )
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        report = None
+    finally:
+        db.disconnect()
+    
+    if not report:
+        print("\n❌ Maintenance failed!")
+        return 1
+    
+    print_report(report)
+    print("\n✅ Maintenance complete!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
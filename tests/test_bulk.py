@@ -0,0 +1,163 @@
+"""
+Bulk Import Tests
+Row conversion and COPY encoding, no database needed
+"""
+
+import json
+
+import pytest
+
+from backend.bulk import iter_records, parse_states, record_to_row
+from backend.database import CopyRowStream, copy_text_value
+
+# ========================================
+# COPY ENCODING
+# ========================================
+
+@pytest.mark.parametrize('value, expected', [
+    (None, '\\N'),
+    ('', ''),
+    ('plain text', 'plain text'),
+    ('tab\there', 'tab\\there'),
+    ('line\nbreak', 'line\\nbreak'),
+    ('carriage\rreturn', 'carriage\\rreturn'),
+    ('back\\slash', 'back\\\\slash'),
+    ('\\N', '\\\\N'),
+    ('all\\\t\n\r', 'all\\\\\\t\\n\\r'),
+])
+def test_copy_text_value(value, expected):
+    assert copy_text_value(value) == expected
+
+def read_all(stream, size):
+    chunks = []
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return ''.join(chunks)
+        chunks.append(chunk)
+
+def test_copy_row_stream_encodes_rows():
+    rows = [('a', None, 'b\tc'), ('d\ne', '', 'f')]
+    stream = CopyRowStream(rows)
+
+    assert read_all(stream, 8192) == 'a\t\\N\tb\\tc\nd\\ne\t\tf\n'
+    assert stream.count == 2
+
+@pytest.mark.parametrize('rows_per_block, read_size', [
+    (1, 3),
+    (2, 1),
+    (3, 8192),
+    (1000, -1),
+])
+def test_copy_row_stream_block_boundaries(rows_per_block, read_size):
+    rows = [(str(i), f'value {i}') for i in range(10)]
+    expected = ''.join(f'{i}\tvalue {i}\n' for i in range(10))
+
+    stream = CopyRowStream(rows)
+    stream.ROWS_PER_BLOCK = rows_per_block
+
+    assert read_all(stream, read_size) == expected
+    assert stream.count == 10
+
+def test_copy_row_stream_empty():
+    stream = CopyRowStream([])
+
+    assert stream.read(8192) == ''
+    assert stream.count == 0
+
+# ========================================
+# ROW CONVERSION
+# ========================================
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ([], None),
+    (['None'], None),
+    (['N/A', ''], None),
+    (['Johor'], 'Johor'),
+    ([' Johor ', 'None', 'Kedah'], 'Johor|Kedah'),
+    ('Johor|Kedah', 'Johor|Kedah'),
+    ('Johor, Kedah', 'Johor|Kedah'),
+    ('Negeri Sembilan|Kuala Lumpur', 'Negeri Sembilan|Kuala Lumpur'),
+    ('N/A', None),
+])
+def test_parse_states(value, expected):
+    assert parse_states(value) == expected
+
+def test_record_to_row_matches_metadata_test_shape():
+    record = {
+        'title': ' Headline ',
+        'link': 'https://example.com/a',
+        'description': 'Body',
+        'published': 'Wed, 11 Feb 2026 16:12:00 +08:00',
+        'source': 'The Star',
+        'author': 'N/A',
+        'category': 'None',
+        'scraped_at': '2026-02-11 16:23:52.223737',
+        'image_url': '',
+        'states_mentioned': ['Johor', 'None'],
+    }
+
+    assert record_to_row(record) == (
+        'Headline',
+        'https://example.com/a',
+        'Body',
+        'Wed, 11 Feb 2026 16:12:00 +08:00',
+        'The Star',
+        None,
+        None,
+        '2026-02-11 16:23:52.223737',
+        None,
+        'Johor',
+    )
+
+def test_record_to_row_accepts_database_column_names():
+    record = {
+        'title': 'Headline',
+        'url': 'https://example.com/b',
+        'published_date': '2026-02-11',
+        'source_name': 'Bernama',
+    }
+
+    row = record_to_row(record)
+
+    assert row[1] == 'https://example.com/b'
+    assert row[3] == '2026-02-11'
+    assert row[4] == 'Bernama'
+    assert row[9] is None
+
+# ========================================
+# READERS
+# ========================================
+
+RECORD = {'title': 'Headline', 'link': 'https://example.com/a', 'source': 'The Star'}
+
+def write_jsonl(path):
+    path.write_text(json.dumps(RECORD) + '\n\n', encoding='utf-8')
+
+def write_csv(path):
+    path.write_text('title,link,source\nHeadline,https://example.com/a,The Star\n',
+                    encoding='utf-8')
+
+def write_json(path):
+    data = {'The Star': [{'title': 'Headline', 'link': 'https://example.com/a'}]}
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+@pytest.mark.parametrize('filename, writer', [
+    ('dump.jsonl', write_jsonl),
+    ('dump.NDJSON', write_jsonl),
+    ('dump.csv', write_csv),
+    ('dump.json', write_json),
+])
+def test_iter_records_dispatch(tmp_path, filename, writer):
+    path = tmp_path / filename
+    writer(path)
+
+    records = list(iter_records(str(path)))
+
+    assert len(records) == 1
+    assert {key: records[0][key] for key in RECORD} == RECORD
+
+def test_iter_records_rejects_unknown_extension(tmp_path):
+    with pytest.raises(ValueError):
+        iter_records(str(tmp_path / 'dump.xml'))
@@ -0,0 +1,293 @@
+"""
+Image Resolver Tests
+Runs the resolver against a local HTTP server
+"""
+
+import time
+import socket
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.image_resolver import (
+    MAX_HOST_FAILURES, MAX_URL_LENGTH, ImageResolver, enrich_images, parse_image_size
+)
+
+# ========================================
+# SAMPLE IMAGES
+# ========================================
+
+def make_png(width, height, padding=0):
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + header + b'\0' * padding
+
+def make_gif(width, height):
+    return b'GIF89a' + struct.pack('<HH', width, height) + b'\0' * 16
+
+def make_jpeg(width, height):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\0' + b'\0' * 9
+    sof0 = b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, height, width, 3) + b'\0' * 9
+    return b'\xff\xd8' + app0 + sof0 + b'\xff\xd9'
+
+def make_webp(chunk, payload):
+    body = b'WEBP' + chunk + struct.pack('<I', len(payload)) + payload
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+def make_webp_vp8(width, height):
+    frame = b'\x9d\x01\x2a' + struct.pack('<HH', width, height)
+    return make_webp(b'VP8 ', b'\0\0\0' + frame + b'\0' * 8)
+
+def make_webp_vp8l(width, height):
+    bits = (width - 1) | ((height - 1) << 14)
+    return make_webp(b'VP8L', b'\x2f' + bits.to_bytes(4, 'little') + b'\0' * 8)
+
+def make_webp_vp8x(width, height):
+    payload = b'\0' * 4 + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little')
+    return make_webp(b'VP8X', payload)
+
+LARGE_PNG = make_png(1200, 800, padding=200000)
+
+FILES = {
+    '/large.png': ('image/png', LARGE_PNG),
+    '/photo.gif': ('image/gif', make_gif(64, 32)),
+    '/photo.jpg': ('image/jpeg; charset=binary', make_jpeg(640, 480)),
+    '/photo.webp': ('image/webp', make_webp_vp8x(300, 200)),
+    '/no-range/photo.gif': ('image/gif', make_gif(10, 20)),
+}
+
+# ========================================
+# LOCAL SERVER
+# ========================================
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """Serves FILES, honouring Range; /no-range/ answers GET with 405"""
+
+    protocol_version = 'HTTP/1.1'
+    log = []
+
+    def log_message(self, *args):
+        pass
+
+    def _record(self):
+        ImageHandler.log.append((self.command, self.path, self.client_address[1],
+                                 self.headers.get('Range')))
+
+    def _send(self, status, content_type, body, extra_headers=None, head=False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._record()
+        if self.path not in FILES:
+            self._send(404, 'text/plain', b'', head=True)
+            return
+        content_type, body = FILES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+    def do_GET(self):
+        self._record()
+        if self.path not in FILES:
+            self._send(404, 'text/plain', b'not found')
+            return
+        if self.path.startswith('/no-range/'):
+            self._send(405, 'text/plain', b'method not allowed')
+            return
+
+        content_type, body = FILES[self.path]
+        range_header = self.headers.get('Range')
+        if range_header and range_header.startswith('bytes=0-'):
+            end = min(int(range_header[len('bytes=0-'):]), len(body) - 1)
+            self._send(206, content_type, body[:end + 1], {
+                'Content-Range': f'bytes 0-{end}/{len(body)}'
+            })
+        else:
+            self._send(200, content_type, body)
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def unresponsive_host():
+    """A listening socket that never accepts, so requests time out"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(16)
+    yield f'http://127.0.0.1:{sock.getsockname()[1]}'
+    sock.close()
+
+@pytest.fixture(autouse=True)
+def clear_log():
+    ImageHandler.log.clear()
+
+class FakeDatabase:
+    """In-memory stand-in for the image_metadata cache"""
+
+    def __init__(self):
+        self.cache = {}
+        self.applied = []
+
+    def get_cached_image_urls(self, urls):
+        return {url for url in urls if url in self.cache}
+
+    def save_image_metadata(self, metadata):
+        for item in metadata:
+            self.cache[item['url']] = item
+        return True
+
+    def apply_image_metadata(self, urls):
+        self.applied.append(list(urls))
+        return True
+
+# ========================================
+# parse_image_size
+# ========================================
+
+@pytest.mark.parametrize('data, expected', [
+    (make_png(1200, 800), (1200, 800)),
+    (make_gif(64, 32), (64, 32)),
+    (make_jpeg(640, 480), (640, 480)),
+    (make_webp_vp8(320, 240), (320, 240)),
+    (make_webp_vp8l(100, 50), (100, 50)),
+    (make_webp_vp8x(300, 200), (300, 200)),
+    (b'not an image', (None, None)),
+    (b'', (None, None)),
+])
+def test_parse_image_size(data, expected):
+    assert tuple(parse_image_size(data)) == expected
+
+# ========================================
+# ImageResolver
+# ========================================
+
+def test_range_request(server):
+    metadata = ImageResolver(timeout=5).resolve(server + '/large.png')
+
+    assert metadata['status'] == 'ok'
+    assert metadata['content_type'] == 'image/png'
+    assert metadata['byte_size'] == len(LARGE_PNG)
+    assert (metadata['width'], metadata['height']) == (1200, 800)
+    assert ImageHandler.log[0][3] == 'bytes=0-65535'
+
+def test_content_type_parameters_are_stripped(server):
+    metadata = ImageResolver(timeout=5).resolve(server + '/photo.jpg')
+
+    assert metadata['content_type'] == 'image/jpeg'
+    assert (metadata['width'], metadata['height']) == (640, 480)
+
+def test_head_fallback_on_405(server):
+    metadata = ImageResolver(timeout=5).resolve(server + '/no-range/photo.gif')
+
+    assert metadata['status'] == 'ok'
+    assert metadata['content_type'] == 'image/gif'
+    assert metadata['byte_size'] == len(FILES['/no-range/photo.gif'][1])
+    assert [entry[0] for entry in ImageHandler.log] == ['GET', 'HEAD']
+
+def test_missing_image_is_an_error(server):
+    metadata = ImageResolver(timeout=5).resolve(server + '/missing.png')
+
+    assert metadata['status'] == 'error'
+    assert metadata['content_type'] is None
+
+def test_unsupported_scheme_is_an_error():
+    results = ImageResolver(timeout=5).resolve_many(['data:image/png;base64,AAAA'])
+
+    assert results[0]['status'] == 'error'
+
+def test_batch_is_deduplicated(server):
+    urls = [server + '/photo.gif', server + '/photo.webp', server + '/photo.gif']
+    results = ImageResolver(timeout=5).resolve_many(urls)
+
+    assert [item['url'] for item in results] == [server + '/photo.gif', server + '/photo.webp']
+    assert [entry[1] for entry in ImageHandler.log].count('/photo.gif') == 1
+
+def test_connections_are_reused_per_host(server):
+    urls = [server + path for path in ('/large.png', '/photo.gif', '/photo.jpg', '/photo.webp')]
+    results = ImageResolver(max_workers=4, per_host=1, timeout=5).resolve_many(urls)
+
+    assert all(item['status'] == 'ok' for item in results)
+    client_ports = {entry[2] for entry in ImageHandler.log}
+    assert len(client_ports) == 1
+
+def test_unresponsive_host_gives_up(unresponsive_host):
+    urls = [f'{unresponsive_host}/{i}.png' for i in range(20)]
+    resolver = ImageResolver(per_host=1, timeout=0.5)
+
+    start = time.monotonic()
+    results = resolver.resolve_many(urls)
+    elapsed = time.monotonic() - start
+
+    assert [item['url'] for item in results] == urls
+    assert all(item['status'] == 'error' for item in results)
+    # Only the first MAX_HOST_FAILURES lookups wait for the timeout
+    assert elapsed < 0.5 * (MAX_HOST_FAILURES + 2)
+
+def test_deadline_stops_lanes(unresponsive_host):
+    urls = [f'{unresponsive_host}/{i}.png' for i in range(20)]
+    resolver = ImageResolver(per_host=2, timeout=1)
+
+    results = resolver.resolve_many(urls, deadline=time.monotonic() + 0.5)
+
+    # Each lane starts one lookup before the deadline, then stops
+    assert len(results) == 2
+
+def test_passed_deadline_sends_nothing(server):
+    results = ImageResolver(timeout=5).resolve_many(
+        [server + '/photo.gif'], deadline=time.monotonic()
+    )
+
+    assert results == []
+    assert ImageHandler.log == []
+
+# ========================================
+# enrich_images
+# ========================================
+
+def test_second_run_hits_the_cache(server):
+    db = FakeDatabase()
+    resolver = ImageResolver(timeout=5)
+    urls = [server + '/photo.gif', server + '/photo.webp']
+
+    assert enrich_images(db, urls, resolver) == 2
+    requests_after_first_run = len(ImageHandler.log)
+
+    assert enrich_images(db, urls, resolver) == 0
+    assert len(ImageHandler.log) == requests_after_first_run
+    assert db.applied == [urls, urls]
+
+def test_unresolvable_urls_are_skipped(server):
+    db = FakeDatabase()
+    urls = [
+        'data:image/png;base64,' + 'A' * 5000,
+        server + '/photo.gif?' + 'x' * MAX_URL_LENGTH,
+        'ftp://example.com/photo.gif',
+    ]
+
+    assert enrich_images(db, urls, ImageResolver(timeout=5)) == 0
+    assert db.cache == {}
+    assert db.applied == []
+    assert ImageHandler.log == []
+
+def test_unfinished_urls_are_not_cached(server):
+    db = FakeDatabase()
+    urls = [server + '/photo.gif']
+
+    assert enrich_images(db, urls, ImageResolver(timeout=5), deadline=time.monotonic()) == 0
+    assert db.cache == {}
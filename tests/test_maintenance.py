@@ -0,0 +1,47 @@
+"""
+Maintenance Tests
+VACUUM VERBOSE parsing, no database needed
+"""
+
+import pytest
+
+from backend.database import count_removed_tuples
+
+PG16_ARTICLES = (
+    'finished vacuuming "news_db.public.articles": index scans: 1\n'
+    'pages: 0 removed, 120 remain, 120 scanned (100.00% of total)\n'
+    'tuples: 5000 removed, 1200 remain, 0 are dead but not yet removable\n'
+)
+PG16_TOAST = (
+    'finished vacuuming "news_db.pg_toast.pg_toast_16420": index scans: 0\n'
+    'tuples: 7 removed, 0 remain, 0 are dead but not yet removable\n'
+)
+PG16_ARTICLE_STATES = (
+    'finished vacuuming "news_db.public.article_states": index scans: 1\n'
+    'tuples: 9000 removed, 2400 remain, 0 are dead but not yet removable\n'
+)
+PG13_ARTICLES = (
+    '"articles": found 42 removable, 1200 nonremovable row versions '
+    'in 120 out of 120 pages'
+)
+FULL_ARTICLES = (
+    '"public.articles": found 300 removable, 900 nonremovable row versions '
+    'in 100 pages'
+)
+ANALYZE_ARTICLES = (
+    'analyzing "public.articles"\n'
+    '"articles": scanned 120 of 120 pages, containing 1200 live rows'
+)
+
+@pytest.mark.parametrize('table, notices, expected', [
+    ('articles', [], 0),
+    ('articles', [PG16_ARTICLES], 5000),
+    ('articles', [PG16_ARTICLES, PG16_TOAST, ANALYZE_ARTICLES], 5000),
+    ('articles', [PG16_ARTICLE_STATES], 0),
+    ('article_states', [PG16_ARTICLES, PG16_ARTICLE_STATES], 9000),
+    ('articles', [PG13_ARTICLES], 42),
+    ('articles', [FULL_ARTICLES], 300),
+    ('articles', [PG13_ARTICLES, FULL_ARTICLES], 342),
+])
+def test_count_removed_tuples(table, notices, expected):
+    assert count_removed_tuples(table, notices) == expected